@@ -19,15 +19,57 @@ Notes:
 import csv
 import re
 import sys
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 
 DEFAULT_DLC = 8
 DEFAULT_SENDER = "VOSP"
 DEFAULT_RECEIVER = "Vector__XXX"
 
+NON_NAME_RE = re.compile(r"[^A-Za-z0-9_]")
+
+# Everything up to the first BO_: version, new-symbols list, bit timing, nodes
+DBC_HEADER = f"""\
+VERSION ""
+
+NS_ :
+\tNS_DESC_
+\tCM_
+\tBA_DEF_
+\tBA_
+\tVAL_
+\tCAT_DEF_
+\tCAT_
+\tFILTER
+\tBA_DEF_DEF_
+\tEV_DATA_
+\tENVVAR_DATA_
+\tSGTYPE_
+\tSGTYPE_VAL_
+\tBA_DEF_SGTYPE_
+\tBA_SGTYPE_
+\tSIG_TYPE_REF_
+\tVAL_TABLE_
+\tSIG_GROUP_
+\tSIG_VALTYPE_
+\tSIGTYPE_VALTYPE_
+\tBO_TX_BU_
+\tBA_DEF_REL_
+\tBA_REL_
+\tBA_DEF_DEF_REL_
+\tBU_SG_REL_
+\tBU_EV_REL_
+\tBU_BO_REL_
+\tSG_MUL_VAL_
+
+BS_:
+
+BU_: {DEFAULT_SENDER}
+"""
+
 def sanitize_name(s: str) -> str:
     s = s.strip()
-    s = re.sub(r"[^A-Za-z0-9_]", "_", s)
+    s = NON_NAME_RE.sub("_", s)
     if not s:
         s = "SIG"
     if s[0].isdigit():
@@ -52,15 +94,29 @@ def parse_float(s: str, default: float) -> float:
         return default
     return float(s)
 
+SIGNED_WORDS = frozenset({"signed", "s", "1", "true", "yes"})
+# Common variants we might see:
+# "motorola", "big", "be", "msb", "1"
+BIG_ENDIAN_WORDS = frozenset({"motorola", "big", "be", "msb", "1", "true", "yes"})
+
 def is_signed(s: str) -> bool:
     t = (s or "").strip().lower()
-    return t in ("signed", "s", "1", "true", "yes")
+    return t in SIGNED_WORDS
 
 def is_big_endian(s: str) -> bool:
     t = (s or "").strip().lower()
-    # Common variants we might see:
-    # "motorola", "big", "be", "msb", "1"
-    return t in ("motorola", "big", "be", "msb", "1", "true", "yes")
+    return t in BIG_ENDIAN_WORDS
+
+SIGNAL_COLUMNS = ("name", "can_id", "units", "start_bit", "bit_length", "offset", "scale", "max", "min", "signedness", "endian", "dlc")
+
+def column_indices(header, names):
+    # absent columns point one past the header; rows get padded to width
+    col = {h: i for i, h in enumerate(header)}
+    width = len(header)
+    idx = [col.get(n, width) for n in names]
+    if width in idx:
+        width += 1
+    return idx, width
 
 def main() -> int:
     if len(sys.argv) != 3:
@@ -70,101 +126,68 @@ def main() -> int:
     input_csv = sys.argv[1]
     output_dbc = sys.argv[2]
 
-    rows = []
+    # (can_id, row) pairs in file order
+    entries = []
     with open(input_csv, "r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        idx, width = column_indices(next(r, []), SIGNAL_COLUMNS)
+        NAME, CID, UNITS, START, LEN, OFF, SCALE, VMAX, VMIN, SIGNED, END, DLC = idx
         for row in r:
-            if not row.get("name"):
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            if not row[NAME]:
                 continue
-            rows.append(row)
-
-    # Group signals by CAN ID
-    by_id = defaultdict(list)
-    for row in rows:
-        can_id = parse_can_id(row["can_id"])
-        by_id[can_id].append(row)
-
-    # Build DBC
-    lines = []
-    lines.append('VERSION ""')
-    lines.append("")
-    lines.append("NS_ :")
-    lines.append("\tNS_DESC_")
-    lines.append("\tCM_")
-    lines.append("\tBA_DEF_")
-    lines.append("\tBA_")
-    lines.append("\tVAL_")
-    lines.append("\tCAT_DEF_")
-    lines.append("\tCAT_")
-    lines.append("\tFILTER")
-    lines.append("\tBA_DEF_DEF_")
-    lines.append("\tEV_DATA_")
-    lines.append("\tENVVAR_DATA_")
-    lines.append("\tSGTYPE_")
-    lines.append("\tSGTYPE_VAL_")
-    lines.append("\tBA_DEF_SGTYPE_")
-    lines.append("\tBA_SGTYPE_")
-    lines.append("\tSIG_TYPE_REF_")
-    lines.append("\tVAL_TABLE_")
-    lines.append("\tSIG_GROUP_")
-    lines.append("\tSIG_VALTYPE_")
-    lines.append("\tSIGTYPE_VALTYPE_")
-    lines.append("\tBO_TX_BU_")
-    lines.append("\tBA_DEF_REL_")
-    lines.append("\tBA_REL_")
-    lines.append("\tBA_DEF_DEF_REL_")
-    lines.append("\tBU_SG_REL_")
-    lines.append("\tBU_EV_REL_")
-    lines.append("\tBU_BO_REL_")
-    lines.append("\tSG_MUL_VAL_")
-    lines.append("")
-    lines.append("BS_:")
-    lines.append("")
-    lines.append(f"BU_: {DEFAULT_SENDER}")
-    lines.append("")
-
-    # Deterministic ordering
-    for can_id in sorted(by_id.keys()):
-        sigs = by_id[can_id]
-
-        # message name: MSG_<ID>
-        msg_name = f"MSG_{can_id}"
-        dlc = DEFAULT_DLC
-        for s in sigs:
-            dlc = parse_int(s.get("dlc", ""), dlc)
-
-        lines.append(f"BO_ {can_id} {msg_name}: {dlc} {DEFAULT_SENDER}")
-
-        for s in sigs:
-            name = sanitize_name(s["name"])
-            start_bit = parse_int(s.get("start_bit", ""), 0)
-            bit_len = parse_int(s.get("bit_length", ""), 1)
-            offset = parse_float(s.get("offset", ""), 0.0)
-            scale = parse_float(s.get("scale", ""), 1.0)
-            vmin = parse_float(s.get("min", ""), 0.0)
-            vmax = parse_float(s.get("max", ""), 0.0)
-            units = (s.get("units", "") or "").strip()
-
-            signed = is_signed(s.get("signedness", ""))
-            big_end = is_big_endian(s.get("endian", ""))
-
-            # DBC signal format:
-            # SG_ <name> : <start>|<len>@<endian><sign> (<factor>,<offset>) [min|max] "<unit>" <receiver>
-            # endian: 0 = Motorola (big), 1 = Intel (little)
-            endian_num = 0 if big_end else 1
-            sign_char = "-" if signed else "+"
-
-            lines.append(
-                f' SG_ {name} : {start_bit}|{bit_len}@{endian_num}{sign_char} '
-                f'({scale},{offset}) [{vmin}|{vmax}] "{units}" {DEFAULT_RECEIVER}'
-            )
-
-        lines.append("")
-
-    with open(output_dbc, "w", encoding="utf-8", newline="\n") as f:
-        f.write("\n".join(lines).rstrip() + "\n")
-
-    print(f"DBC written: {output_dbc} (messages: {len(by_id)}, signals: {len(rows)})")
+            entries.append((parse_can_id(row[CID]), row))
+
+    # Group signals by CAN ID. Deterministic ordering: the sort is stable,
+    # so signals keep their file order within a message.
+    entries.sort(key=itemgetter(0))
+
+    # Write DBC straight to the file; no in-memory copy of the output
+    messages = 0
+    with open(output_dbc, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+        write = f.write
+        write(DBC_HEADER)
+
+        for can_id, group in groupby(entries, key=itemgetter(0)):
+            sigs = [row for _, row in group]
+            messages += 1
+
+            # message name: MSG_<ID>
+            msg_name = f"MSG_{can_id}"
+            dlc = DEFAULT_DLC
+            for s in sigs:
+                dlc = parse_int(s[DLC], dlc)
+
+            write(f"\nBO_ {can_id} {msg_name}: {dlc} {DEFAULT_SENDER}\n")
+
+            for s in sigs:
+                name = sanitize_name(s[NAME])
+                start_bit = parse_int(s[START], 0)
+                bit_len = parse_int(s[LEN], 1)
+                offset = parse_float(s[OFF], 0.0)
+                scale = parse_float(s[SCALE], 1.0)
+                vmin = parse_float(s[VMIN], 0.0)
+                vmax = parse_float(s[VMAX], 0.0)
+                units = s[UNITS].strip()
+
+                signed = is_signed(s[SIGNED])
+                big_end = is_big_endian(s[END])
+
+                # DBC signal format:
+                # SG_ <name> : <start>|<len>@<endian><sign> (<factor>,<offset>) [min|max] "<unit>" <receiver>
+                # endian: 0 = Motorola (big), 1 = Intel (little)
+                endian_num = 0 if big_end else 1
+                sign_char = "-" if signed else "+"
+
+                write(
+                    f' SG_ {name} : {start_bit}|{bit_len}@{endian_num}{sign_char} '
+                    f'({scale},{offset}) [{vmin}|{vmax}] "{units}" {DEFAULT_RECEIVER}\n'
+                )
+
+    print(f"DBC written: {output_dbc} (messages: {messages}, signals: {len(entries)})")
     return 0
 
 if __name__ == "__main__":
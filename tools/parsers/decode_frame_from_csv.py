@@ -2,8 +2,11 @@
 
 import csv
 import sys
+from functools import lru_cache
 
 
+# the signal CSV repeats each ID once per signal
+@lru_cache(maxsize=4096)
 def parse_can_id(s: str) -> int:
     s = s.strip()
     if s.lower().startswith("0x"):
@@ -15,6 +18,14 @@ def parse_bytes(hex_str: str) -> bytes:
     parts = hex_str.replace(",", " ").split()
     if len(parts) != 8:
         raise ValueError("Expected exactly 8 bytes.")
+    # common case: 1-2 digit hex bytes, decoded in one C call
+    hexdata = "".join([p.zfill(2) for p in parts])
+    if len(hexdata) == 16:
+        try:
+            return bytes.fromhex(hexdata)
+        except ValueError:
+            pass
+    # anything else ("0x1F", "+1", bad input) keeps int()'s rules and errors
     return bytes(int(p, 16) for p in parts)
 
 
@@ -26,15 +37,11 @@ def get_little_endian(data: bytes, start_bit: int, bit_len: int) -> int:
 
 def get_big_endian(data: bytes, start_bit: int, bit_len: int) -> int:
     # Motorola bit numbering:
-    # Bit 0 = MSB of byte 0
-    result = 0
-    for i in range(bit_len):
-        bit_index = start_bit + i
-        byte_index = bit_index // 8
-        bit_in_byte = 7 - (bit_index % 8)
-        bit = (data[byte_index] >> bit_in_byte) & 1
-        result = (result << 1) | bit
-    return result
+    # Bit 0 = MSB of byte 0, so bits run MSB-first through the big-endian
+    # word and a field is a single shift/mask of it
+    val = int.from_bytes(data, byteorder="big", signed=False)
+    mask = (1 << bit_len) - 1
+    return (val >> (len(data) * 8 - start_bit - bit_len)) & mask
 
 
 def to_signed(value: int, bit_len: int) -> int:
@@ -44,6 +51,19 @@ def to_signed(value: int, bit_len: int) -> int:
     return value
 
 
+SIGNAL_COLUMNS = ("name", "can_id", "units", "start_bit", "bit_length", "offset", "scale", "signedness", "endian")
+
+
+def column_indices(header, names):
+    # absent columns point one past the header; rows get padded to width
+    col = {h: i for i, h in enumerate(header)}
+    width = len(header)
+    idx = [col.get(n, width) for n in names]
+    if width in idx:
+        width += 1
+    return idx, width
+
+
 def main() -> int:
     if len(sys.argv) != 4:
         print("Usage: decode_frame_from_csv.py <csv> <can_id> <8 bytes hex>")
@@ -55,11 +75,17 @@ def main() -> int:
 
     rows = []
     with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        idx, width = column_indices(next(r, []), SIGNAL_COLUMNS)
+        NAME, CID, UNITS, START, LEN, OFF, SCALE, SIGNED, END = idx
         for row in r:
-            if not row.get("can_id"):
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            if not row[CID]:
                 continue
-            if parse_can_id(row["can_id"]) == can_id:
+            if parse_can_id(row[CID]) == can_id:
                 rows.append(row)
 
     if not rows:
@@ -70,14 +96,14 @@ def main() -> int:
     print("-" * 60)
 
     for row in rows:
-        name = row["name"]
-        units = row["units"]
-        start_bit = int(float(row["start_bit"]))
-        bit_len = int(float(row["bit_length"]))
-        offset = float(row["offset"])
-        scale = float(row["scale"])
-        signedness = row["signedness"].lower()
-        endian = row["endian"].lower()
+        name = row[NAME]
+        units = row[UNITS]
+        start_bit = int(float(row[START]))
+        bit_len = int(float(row[LEN]))
+        offset = float(row[OFF])
+        scale = float(row[SCALE])
+        signedness = row[SIGNED].lower()
+        endian = row[END].lower()
 
         if "motorola" in endian or "big" in endian:
             raw = get_big_endian(data, start_bit, bit_len)
@@ -14,7 +14,11 @@ Output:
   - CSV rows: timestamp,can_id,signal,value,units,raw
 
 Usage:
-  py tools/parsers/decode_log_from_csv.py <signals_csv> <log_file> <out_csv>
+  py tools/parsers/decode_log_from_csv.py [--jobs N] <signals_csv> <log_file> <out_csv>
+
+  --jobs N   split the log into N line-aligned byte ranges and decode them in
+             N worker processes; output order is unchanged, and with N > 1
+             the log must be a regular file (default: 1)
 
 Example:
   py tools/parsers/decode_log_from_csv.py docs/can/racelogic/volt_public_signals.csv data/raw/candump.log data/processed/decoded.csv
@@ -22,11 +26,21 @@ Example:
 
 from __future__ import annotations
 
+import argparse
 import csv
-import sys
+import os
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# frames buffered before each decode/write pass
+BATCH_FRAMES = 65536
+# read-ahead / write-behind for the log and output files
+IO_BUFFER_BYTES = 1 << 22
 
 
 @dataclass
@@ -41,6 +55,27 @@ class SignalDef:
     signed: bool
     big_endian: bool
     dlc: int
+    # extraction layout: raw = (word >> shift) & mask, where word is the
+    # 8-byte payload read in the signal's byte order; sign_bit is 0 when it
+    # lies beyond the payload and so can never be set
+    shift: int = field(init=False)
+    mask: int = field(init=False)
+    sign_bit: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.big_endian:
+            # Motorola bit i (MSB of byte 0 first) is bit 63-i of the
+            # big-endian word, so the field is contiguous there
+            # (load_signals rejects fields that run past bit 63)
+            self.shift = 64 - self.start_bit - self.bit_length
+            self.mask = (1 << self.bit_length) - 1
+        else:
+            # Intel bits past the payload read as 0, so only the part of
+            # the field inside the 64-bit word needs masking
+            width = max(0, min(self.bit_length, 64 - self.start_bit))
+            self.shift = self.start_bit if width else 0
+            self.mask = (1 << width) - 1
+        self.sign_bit = 1 << (self.bit_length - 1) if 0 < self.bit_length <= 64 else 0
 
 
 CAN_DUMP_RE = re.compile(
@@ -56,15 +91,17 @@ CAN_DUMP_RE = re.compile(
     re.VERBOSE,
 )
 
-CSV_RE = re.compile(r"^\s*(?P<ts>[^,]+)\s*,\s*(?P<id>[^,]+)\s*,\s*(?P<rest>.+)\s*$")
+HEX_RE = re.compile(r"[0-9A-Fa-f]+")
 
 
+# CSV logs repeat a handful of ID strings on every line
+@lru_cache(maxsize=4096)
 def parse_can_id(s: str) -> int:
     s = s.strip()
     if s.lower().startswith("0x"):
         return int(s, 16)
     # if it's purely hex without 0x (e.g., 4D1), treat as hex in log contexts
-    if re.fullmatch(r"[0-9A-Fa-f]+", s) and any(c.isalpha() for c in s):
+    if HEX_RE.fullmatch(s) and not s.isdigit():
         return int(s, 16)
     # fallback decimal
     return int(float(s))
@@ -88,53 +125,72 @@ def parse_bytes_from_csv_parts(rest: str) -> bytes:
         parts = [p.strip() for p in parts[0].split()]
     if len(parts) < 8:
         raise ValueError("CSV frame line must contain 8 data bytes after id.")
-    return bytes(int(p, 16) for p in parts[:8])
-
-
-def get_little_endian(data8: bytes, start_bit: int, bit_len: int) -> int:
-    val = int.from_bytes(data8, byteorder="little", signed=False)
-    mask = (1 << bit_len) - 1
-    return (val >> start_bit) & mask
-
-
-def get_big_endian(data8: bytes, start_bit: int, bit_len: int) -> int:
-    # Motorola: bit 0 is MSB of byte 0
-    result = 0
-    for i in range(bit_len):
-        bit_index = start_bit + i
-        byte_index = bit_index // 8
-        bit_in_byte = 7 - (bit_index % 8)
-        bit = (data8[byte_index] >> bit_in_byte) & 1
-        result = (result << 1) | bit
-    return result
-
-
-def to_signed(value: int, bit_len: int) -> int:
-    sign_bit = 1 << (bit_len - 1)
-    if value & sign_bit:
-        return value - (1 << bit_len)
-    return value
+    parts = parts[:8]
+    # common case: eight 1-2 digit hex bytes, decoded in one C call
+    hexdata = "".join([p.zfill(2) for p in parts])
+    if len(hexdata) == 16 and "" not in parts:
+        try:
+            return bytes.fromhex(hexdata)
+        except ValueError:
+            pass
+    # anything else ("0x1F", "+1", bad input) keeps int()'s rules and errors
+    return bytes(int(p, 16) for p in parts)
+
+
+def column_indices(header: List[str], names: Sequence[str]) -> Tuple[List[int], int]:
+    """
+    Index of each named column in header, plus the row width to pad to.
+
+    Absent columns point one past the last header column, so once a row is
+    padded to the returned width they read as "".
+    """
+    col = {h: i for i, h in enumerate(header)}
+    width = len(header)
+    idx = [col.get(n, width) for n in names]
+    if width in idx:
+        width += 1
+    return idx, width
+
+
+SIGNAL_COLUMNS = ("name", "can_id", "units", "start_bit", "bit_length", "offset", "scale", "signedness", "endian", "dlc")
+SIGNED_WORDS = frozenset({"signed", "s", "1", "true", "yes"})
+BIG_ENDIAN_WORDS = frozenset({"motorola", "big", "be", "msb", "0", "true", "yes"})
 
 
 def load_signals(signals_csv_path: str) -> Dict[int, List[SignalDef]]:
     by_id: Dict[int, List[SignalDef]] = {}
     with open(signals_csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        idx, width = column_indices(next(r, []), SIGNAL_COLUMNS)
+        NAME, CID, UNITS, START, LEN, OFF, SCALE, SIGNED, END, DLC = idx
         for row in r:
-            if not row.get("name") or not row.get("can_id"):
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            if not row[NAME] or not row[CID]:
                 continue
-            can_id = parse_can_id(row["can_id"])
+            can_id = parse_can_id(row[CID])
+            name = row[NAME].strip()
+            start_bit = int(float(row[START] or 0))
+            bit_length = int(float(row[LEN] or 1))
+            big_endian = row[END].strip().lower() in BIG_ENDIAN_WORDS
+            if big_endian and start_bit + bit_length > 64:
+                raise ValueError(
+                    f"signal {name!r} (CAN ID 0x{can_id:X}): Motorola field "
+                    f"start_bit={start_bit} bit_length={bit_length} runs past bit 63"
+                )
             sd = SignalDef(
-                name=row.get("name", "").strip(),
+                name=name,
                 can_id=can_id,
-                units=row.get("units", "").strip(),
-                start_bit=int(float(row.get("start_bit", "0") or 0)),
-                bit_length=int(float(row.get("bit_length", "1") or 1)),
-                offset=float(row.get("offset", "0") or 0),
-                scale=float(row.get("scale", "1") or 1),
-                signed=(row.get("signedness", "").strip().lower() in ("signed", "s", "1", "true", "yes")),
-                big_endian=(row.get("endian", "").strip().lower() in ("motorola", "big", "be", "msb", "0", "true", "yes")),
-                dlc=int(float(row.get("dlc", "8") or 8)),
+                units=row[UNITS].strip(),
+                start_bit=start_bit,
+                bit_length=bit_length,
+                offset=float(row[OFF] or 0),
+                scale=float(row[SCALE] or 1),
+                signed=(row[SIGNED].strip().lower() in SIGNED_WORDS),
+                big_endian=big_endian,
+                dlc=int(float(row[DLC] or 8)),
             )
             by_id.setdefault(can_id, []).append(sd)
     return by_id
@@ -145,13 +201,15 @@ def parse_frame_line(line: str) -> Optional[Tuple[Optional[str], int, bytes]]:
     if not line or line.startswith("#"):
         return None
 
-    # CSV-ish
-    m = CSV_RE.match(line)
-    if m:
-        ts = m.group("ts").strip()
-        cid = parse_can_id(m.group("id"))
-        data = parse_bytes_from_csv_parts(m.group("rest"))
-        return (ts, cid, data)
+    # CSV-ish: "ts,id,rest" with all three fields non-empty. A plain split
+    # is cheaper than a regex and candump lines skip it entirely.
+    if "," in line:
+        parts = line.split(",", 2)
+        if len(parts) == 3 and all(parts):
+            ts = parts[0].strip()
+            cid = parse_can_id(parts[1])
+            data = parse_bytes_from_csv_parts(parts[2])
+            return (ts, cid, data)
 
     # candump / ID#DATA
     m = CAN_DUMP_RE.match(line)
@@ -166,52 +224,226 @@ def parse_frame_line(line: str) -> Optional[Tuple[Optional[str], int, bytes]]:
     return None
 
 
-def main() -> int:
-    if len(sys.argv) != 4:
-        print(__doc__)
-        return 2
-
-    signals_csv = sys.argv[1]
-    log_path = sys.argv[2]
-    out_csv = sys.argv[3]
-
-    signals_by_id = load_signals(signals_csv)
-
+# decoder closure: (word_le, word_be) -> (signal, value, units, raw)
+Decoder = Callable[[Tuple[int, int]], Tuple[str, float, str, int]]
+# per CAN ID: (hex id, decoders in CSV order, needs word_le, needs word_be)
+DecoderTable = Tuple[str, List[Decoder], bool, bool]
+
+
+def make_decoder(sd: SignalDef) -> Decoder:
+    # everything but the payload is fixed per signal, so bake it in; the
+    # byte order becomes a constant index into the frame's word pair
+    name = sd.name
+    units = sd.units
+    scale = sd.scale
+    offset = sd.offset
+    mask = sd.mask
+    shift = sd.shift
+    k = 1 if sd.big_endian else 0
+
+    if sd.signed:
+        sign_bit = sd.sign_bit
+        wrap = sign_bit << 1
+
+        def decode(words: Tuple[int, int]) -> Tuple[str, float, str, int]:
+            raw = (words[k] >> shift) & mask
+            if raw & sign_bit:
+                raw -= wrap
+            return (name, raw * scale + offset, units, raw)
+    else:
+        def decode(words: Tuple[int, int]) -> Tuple[str, float, str, int]:
+            raw = (words[k] >> shift) & mask
+            return (name, raw * scale + offset, units, raw)
+
+    return decode
+
+
+def build_decoders(sigs: List[SignalDef]) -> DecoderTable:
+    uses_be = any(sd.big_endian for sd in sigs)
+    uses_le = not all(sd.big_endian for sd in sigs)
+    return f"0x{sigs[0].can_id:X}", [make_decoder(sd) for sd in sigs], uses_le, uses_be
+
+
+def decode_batch(
+    decoders_by_id: Dict[int, DecoderTable],
+    batch_ts: List[Optional[str]],
+    batch_ids: List[int],
+    batch_data: List[bytes],
+) -> List[tuple]:
+    rows: List[tuple] = []
+    append = rows.append
+    from_bytes = int.from_bytes
+    for ts, cid, data8 in zip(batch_ts, batch_ids, batch_data):
+        cid_hex, decoders, uses_le, uses_be = decoders_by_id[cid]
+        head = (ts or "", cid_hex)
+        # convert the payload once per frame, and only to the byte orders
+        # this message's signals use
+        words = (
+            from_bytes(data8, "little") if uses_le else 0,
+            from_bytes(data8, "big") if uses_be else 0,
+        )
+        for dec in decoders:
+            append(head + dec(words))
+    return rows
+
+
+def decode_lines(lines: Iterable[str], signals_by_id: Dict[int, List[SignalDef]], f_out) -> Tuple[int, int, int]:
+    """
+    Decode log lines and write CSV rows (no header) to f_out.
+
+    Returns (frames read, frames without signals, rows written).
+    """
     total_frames = 0
     decoded_rows = 0
     skipped_frames = 0
 
-    with open(out_csv, "w", newline="", encoding="utf-8") as f_out:
+    w = csv.writer(f_out)
+    decoders_by_id = {cid: build_decoders(sigs) for cid, sigs in signals_by_id.items()}
+    batch_ts: List[Optional[str]] = []
+    batch_ids: List[int] = []
+    batch_data: List[bytes] = []
+
+    def flush() -> int:
+        rows = decode_batch(decoders_by_id, batch_ts, batch_ids, batch_data)
+        w.writerows(rows)
+        batch_ts.clear()
+        batch_ids.clear()
+        batch_data.clear()
+        return len(rows)
+
+    for line in lines:
+        parsed = parse_frame_line(line)
+        if parsed is None:
+            continue
+
+        ts, cid, data = parsed
+        total_frames += 1
+
+        if cid not in signals_by_id:
+            skipped_frames += 1
+            continue
+
+        # normalize to 8 bytes for bit extraction
+        if len(data) < 8:
+            data8 = data + b"\x00" * (8 - len(data))
+        else:
+            data8 = data[:8]
+
+        batch_ts.append(ts)
+        batch_ids.append(cid)
+        batch_data.append(data8)
+        if len(batch_ids) >= BATCH_FRAMES:
+            decoded_rows += flush()
+
+    if batch_ids:
+        decoded_rows += flush()
+
+    return total_frames, skipped_frames, decoded_rows
+
+
+def split_log(log_path: str, jobs: int) -> List[Tuple[int, int]]:
+    """Cut the log into up to `jobs` byte ranges, each starting at a line."""
+    size = os.path.getsize(log_path)
+    bounds = [0]
+    with open(log_path, "rb") as f:
+        for k in range(1, jobs):
+            f.seek(max(size * k // jobs, bounds[-1]))
+            f.readline()
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def iter_log_range(log_path: str, start: int, end: int) -> Iterator[str]:
+    # Lines whose first byte lies in [start, end). Read as bytes so offsets
+    # are exact; splitting on "\r" as well matches text-mode universal newlines
+    # (the extra empty pieces are skipped by parse_frame_line).
+    with open(log_path, "rb", buffering=IO_BUFFER_BYTES) as f:
+        f.seek(start)
+        pos = start
+        for raw_line in f:
+            line = raw_line.decode("utf-8", errors="replace")
+            if "\r" in line:
+                yield from line.split("\r")
+            else:
+                yield line
+            pos += len(raw_line)
+            if pos >= end:
+                break
+
+
+_worker_signals: Dict[int, List[SignalDef]] = {}
+
+
+def _init_worker(signals_by_id: Dict[int, List[SignalDef]]) -> None:
+    global _worker_signals
+    _worker_signals = signals_by_id
+
+
+def decode_chunk(log_path: str, start: int, end: int, part_path: str) -> Tuple[int, int, int]:
+    with open(part_path, "w", newline="", encoding="utf-8", buffering=IO_BUFFER_BYTES) as f_part:
+        return decode_lines(iter_log_range(log_path, start, end), _worker_signals, f_part)
+
+
+def decode_parallel(log_path: str, signals_by_id: Dict[int, List[SignalDef]], f_out, jobs: int) -> Tuple[int, int, int]:
+    """Decode byte ranges in worker processes, appending their output to f_out in log order."""
+    ranges = split_log(log_path, jobs)
+    if not ranges:  # empty log
+        return (0, 0, 0)
+    out_dir = os.path.dirname(os.path.abspath(f_out.name))
+    parts: List[str] = []
+    try:
+        for _ in ranges:
+            fd, part = tempfile.mkstemp(suffix=".part", dir=out_dir)
+            os.close(fd)
+            parts.append(part)
+
+        with ProcessPoolExecutor(max_workers=len(ranges), initializer=_init_worker, initargs=(signals_by_id,)) as pool:
+            futures = [pool.submit(decode_chunk, log_path, start, end, part) for (start, end), part in zip(ranges, parts)]
+            counts = [fut.result() for fut in futures]
+
+        f_out.flush()
+        for part in parts:
+            with open(part, "rb") as f_part:
+                shutil.copyfileobj(f_part, f_out.buffer, IO_BUFFER_BYTES)
+    finally:
+        for part in parts:
+            os.remove(part)
+
+    return tuple(map(sum, zip(*counts)))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("signals_csv")
+    ap.add_argument("log_file")
+    ap.add_argument("out_csv")
+    ap.add_argument("--jobs", type=int, default=1, metavar="N", help="worker processes; N > 1 needs a regular log file (default: 1)")
+    args = ap.parse_args()
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+    if args.jobs > 1 and not os.path.isfile(args.log_file):
+        # workers seek to their own byte ranges
+        ap.error("--jobs needs the log to be a regular file")
+
+    signals_csv = args.signals_csv
+    log_path = args.log_file
+    out_csv = args.out_csv
+
+    signals_by_id = load_signals(signals_csv)
+
+    with open(out_csv, "w", newline="", encoding="utf-8", buffering=IO_BUFFER_BYTES) as f_out:
         w = csv.writer(f_out)
         w.writerow(["timestamp", "can_id", "signal", "value", "units", "raw"])
 
-        with open(log_path, "r", encoding="utf-8", errors="replace") as f_in:
-            for line in f_in:
-                parsed = parse_frame_line(line)
-                if parsed is None:
-                    continue
-
-                ts, cid, data = parsed
-                total_frames += 1
-
-                # normalize to 8 bytes for bit extraction
-                if len(data) < 8:
-                    data8 = data + b"\x00" * (8 - len(data))
-                else:
-                    data8 = data[:8]
-
-                sigs = signals_by_id.get(cid)
-                if not sigs:
-                    skipped_frames += 1
-                    continue
-
-                for sd in sigs:
-                    raw = get_big_endian(data8, sd.start_bit, sd.bit_length) if sd.big_endian else get_little_endian(data8, sd.start_bit, sd.bit_length)
-                    if sd.signed:
-                        raw = to_signed(raw, sd.bit_length)
-                    value = raw * sd.scale + sd.offset
-                    w.writerow([ts or "", f"0x{cid:X}", sd.name, value, sd.units, raw])
-                    decoded_rows += 1
+        if args.jobs > 1:
+            counts = decode_parallel(log_path, signals_by_id, f_out, args.jobs)
+        else:
+            with open(log_path, "r", encoding="utf-8", errors="replace", buffering=IO_BUFFER_BYTES) as f_in:
+                counts = decode_lines(f_in, signals_by_id, f_out)
+    total_frames, skipped_frames, decoded_rows = counts
 
     print(f"Frames read: {total_frames}")
     print(f"Frames with matching CAN IDs: {total_frames - skipped_frames}")
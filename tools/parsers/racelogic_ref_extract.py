@@ -4,29 +4,53 @@ Extract Racelogic 'Can Data File V1a' .REF channel definitions into CSV.
 """
 
 import csv
+import mmap
 import sys
 import zlib
 
+# compressed bytes handed to zlib per call
+CHUNK_SIZE = 1 << 16
+
 
 def extract_blocks(path):
-    raw = open(path, "rb").read()
     blocks = []
-    i = 0
-
-    while True:
-        j = raw.find(b"\x78\xda", i)
-        if j == -1:
-            break
-
-        d = zlib.decompressobj()
-        out = d.decompress(raw[j:])
-        text = out.decode("utf-8", errors="replace").strip()
-
-        if text:
-            blocks.append(text)
-
-        consumed = len(raw[j:]) - len(d.unused_data)
-        i = j + max(consumed, 2)
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return blocks
+
+    try:
+        with memoryview(mm) as mv:
+            size = len(mm)
+            i = 0
+
+            while True:
+                j = mm.find(b"\x78\xda", i)
+                if j == -1:
+                    break
+
+                # feed bounded chunks until the stream ends, so zlib never
+                # sees (or copies into unused_data) the rest of the file
+                d = zlib.decompressobj()
+                out = bytearray()
+                pos = j
+                while pos < size:
+                    with mv[pos:pos + CHUNK_SIZE] as chunk:
+                        out += d.decompress(chunk)
+                        pos += len(chunk)
+                    if d.eof:
+                        pos -= len(d.unused_data)
+                        break
+                text = out.decode("utf-8", errors="replace").strip()
+
+                if text:
+                    blocks.append(text)
+
+                # resume after the stream (past the magic if it was bogus)
+                i = max(pos, j + 2)
+    finally:
+        mm.close()
 
     return blocks
 